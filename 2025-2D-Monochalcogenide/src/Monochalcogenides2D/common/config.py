@@ -14,7 +14,7 @@ All production scripts should import these settings rather than hard-coding para
 """
 
 from pathlib import Path
-from typing import Final, List, Set
+from typing import Dict, Final, List
 
 # ============================================================
 # Configuration of materials (monochalcogenides) and
@@ -90,6 +90,29 @@ LIST_ORDERED_BC_TAGS: Final[List[str]] = [
     "LPLANE"
 ]
 
+DICT_BC_INCAR_FLAGS: Final[Dict[str, str]] = {
+    "ISPIN": "1",
+    "NSW": "-1",
+    "IBRION": "-1",
+    "LCHARG": ".TRUE.",
+    "LAECHG": ".TRUE."
+}
+
+LIST_BC_REMOVED_TAGS: Final[List[str]] = [
+    "ADDGRID",
+    "EDIFFG",
+    "ISIF",
+    "POTIM",
+    "STRESSTYPE"
+]
+
+# INCAR is not copied: update_incar_bc writes the Bader INCAR straight from the source one
+LIST_BC_INPUT_FILES: Final[List[str]] = [
+    "POSCAR",
+    "POTCAR",
+    "KPOINTS"
+]
+
 
 # ============================================================
 # Configuration of input file parameters (INCAR, POTCAR,
@@ -97,7 +120,6 @@ LIST_ORDERED_BC_TAGS: Final[List[str]] = [
 # ============================================================
 LIST_ELEMENT_POTCAR_D_GW: Final[List[str]] = ['Sn', 'In']
 RATIO_FACTOR: Final[float] = 2.0
-POSCAR_LINES_TO_MODIFY: Final[Set[int]] = {1, 6}
 RK_FACTOR: Final[int] = 30
 
 # ============================================================
@@ -10,13 +10,40 @@ Date: 08/2024
 """
 
 from datetime import datetime
+import multiprocessing
+import os
 import re
 import sys
-from functools import wraps
-from typing import List
-from Monochalcogenides2D.common.config import TOTAL_MQ_SYSTEMS, PATH_FOLDER_LOG
+import time
+from functools import lru_cache, wraps
+from typing import Callable, Dict, Final, Iterator, List
+from Monochalcogenides2D.common.config import LIST_MQ, TOTAL_MQ_SYSTEMS, PATH_FOLDER_LOG
 from loguru import logger
 
+# Month abbreviation to number mapping (supports German/English variants)
+# Handles common bilingual scenarios (e.g., Mai/May, Okt/Oct)
+_MONTH_ABBREVIATIONS: Final[Dict[str, int]] = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4,
+    'Mai': 5, 'May': 5,  # Dual support for German/English
+    'Jun': 6, 'Jul': 7, 'Aug': 8, 'Sep': 9,
+    'Okt': 10, 'Nov': 11, 'Dez': 12
+}
+
+# Minimum time (seconds) between two progress bar redraws and the time of the last redraw
+_PROGRESS_BAR_MIN_INTERVAL: Final[float] = 0.1
+_progress_bar_last_draw = 0.0
+
+# Chemical element symbols in a material name (e.g., 'GaTe' -> 'Ga', 'Te')
+_PATTERN_CHEM_COMPOSITION = re.compile(r"([A-Z][a-z]*)")
+
+# Elements of every studied material, split once at import (e.g., 'AlS' -> ['Al', 'S'])
+_MQ_ELEMENTS: Final[Dict[str, List[str]]] = {mq: _PATTERN_CHEM_COMPOSITION.findall(mq) for mq in LIST_MQ}
+
+# Components of a POTCAR TITEL date (e.g., '15Mai2023' -> 'Mai', '15', '2023')
+_PATTERN_MONTH_ABB = re.compile(r'([A-z]{3})')
+_PATTERN_DAY = re.compile(r'(\d{2})')
+_PATTERN_YEAR = re.compile(r'(\d{4})')
+
 
 def init_logger(task_name: str = "default", level: str = "INFO"):
     path_folder_task = PATH_FOLDER_LOG.joinpath(task_name)
@@ -32,6 +59,9 @@ def init_logger(task_name: str = "default", level: str = "INFO"):
         retention="30 days",
         compression="zip",
         level=level,
+        # Messages go through a multiprocess-safe queue written by a single background thread:
+        # the file stays open for the whole run and pool workers never interleave lines
+        enqueue=True,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
     )
 
@@ -117,11 +147,14 @@ def get_mq_elements(mq: str) -> List[str]:
         >>> get_mq_elements('SnTe')
         ['Sn', 'Te']
     """
+    # Materials from LIST_MQ are served from the precomputed table
+    if mq in _MQ_ELEMENTS:
+        return list(_MQ_ELEMENTS[mq])
+
     if not mq or not mq.isalpha():
         raise ValueError("Material name must be non-empty alphabetic string (e.g., 'GaS')")
 
-    chem_composition_re = re.compile(r"([A-Z][a-z]*)")
-    elements = chem_composition_re.findall(mq)
+    elements = _PATTERN_CHEM_COMPOSITION.findall(mq)
 
     if not elements:
         raise ValueError(f"No valid elements found in '{mq}'. Expected format like 'AlS'.")
@@ -129,6 +162,7 @@ def get_mq_elements(mq: str) -> List[str]:
     return elements
 
 
+@lru_cache(maxsize=None)
 def return_data_formatted_titel(string_data):
     """Converts a date string with textual month abbreviation to DD/MM/YYYY format.
 
@@ -148,36 +182,25 @@ def return_data_formatted_titel(string_data):
         - 2-digit day
         - 4-digit year
         Will fail if these components are missing.
+        Results are memoized, since the same POTCAR dates repeat across material systems.
 
     Example:
         >>> return_data_formatted_titel("15 Mai 2023")
         "15/05/2023"
     """
-    # Month abbreviation to number mapping (supports German/English variants)
-    # Handles common bilingual scenarios (e.g., Mai/May, Okt/Oct)
-    month = {
-        'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4,
-        'Mai': 5, 'May': 5,  # Dual support for German/English
-        'Jun': 6, 'Jul': 7, 'Aug': 8, 'Sep': 9,
-        'Okt': 10, 'Nov': 11, 'Dez': 12
-    }
-
     # Extract 3-letter month abbreviation (case-insensitive)
     # Critical for handling variable capitalization in input
-    return_month_abb = r'([A-z]{3})'
-    month_abb = re.search(return_month_abb, string_data).group(1)
+    month_abb = _PATTERN_MONTH_ABB.search(string_data).group(1)
 
     # Convert abbreviation to numeric month using mapping
     # Enables language-agnostic month processing
-    int_month = month[month_abb]
+    int_month = _MONTH_ABBREVIATIONS[month_abb]
 
     # Extract 2-digit day component
-    return_day = r'(\d{2})'
-    day = re.search(return_day, string_data).group(1)
+    day = _PATTERN_DAY.search(string_data).group(1)
 
     # Extract 4-digit year component
-    return_year = r'(\d{4})'
-    year = re.search(return_year, string_data).group(1)
+    year = _PATTERN_YEAR.search(string_data).group(1)
 
     # Create datetime object from components
     # Validates date consistency (e.g., rejects invalid day-month combinations)
@@ -202,11 +225,22 @@ def progress_bar_show(current_value: int):
         Relies on global constant TOTAL_MQ_SYSTEMS representing maximum value.
         Uses carriage return (\r) for in-place updates without newlines.
         Progress capped at 100% if current_value exceeds TOTAL_MQ_SYSTEMS.
+        Redraws are throttled to one every _PROGRESS_BAR_MIN_INTERVAL seconds;
+        the first (0) and final (TOTAL_MQ_SYSTEMS) values are always drawn.
 
     Example:
         With TOTAL_MQ_SYSTEMS=100 and current_value=75:
         Progress: [#######################.....................] 75/100 (75.00%)
     """
+    global _progress_bar_last_draw
+
+    # Skip intermediate redraws that come too fast to be seen
+    # Avoids one terminal write + flush per finished system on short tasks
+    now = time.monotonic()
+    if 0 < current_value < TOTAL_MQ_SYSTEMS and now - _progress_bar_last_draw < _PROGRESS_BAR_MIN_INTERVAL:
+        return
+    _progress_bar_last_draw = now
+
     # Base label for progress display
     text_info = 'Progress:'
 
@@ -239,6 +273,54 @@ def progress_bar_show(current_value: int):
         print()
 
 
+def run_systems_in_pool(worker: Callable, list_systems: list) -> Iterator:
+    """Runs a worker over independent material systems in a process pool, driving the progress bar.
+
+    Each system must write only to its own folder, so the systems can be processed in any order.
+    Results are yielded as soon as each system finishes (completion order, not input order).
+
+    Args:
+        worker (callable): Module-level function taking one item of list_systems
+        list_systems (list): Picklable descriptions of the systems to process
+
+    Yields:
+        Return value of worker for each finished system
+
+    Note:
+        Workers use the platform's default start method. Each worker is initialized with the parent
+        logger, so its messages go to the same enqueued file sink instead of loguru's default stderr handler.
+        Several systems are sent per task to amortize the pickling/IPC round-trip of the pool channel.
+
+    Example:
+        >>> for mq, sp in run_systems_in_pool(process_bader_system, list_systems):
+        ...     logger.info(f"Completed {mq} in space group {sp}")
+    """
+    number_processes = min(len(list_systems), os.cpu_count() or 1)
+    chunk_size = max(1, len(list_systems) // (number_processes * 4))
+
+    system_count = 0
+    progress_bar_show(system_count)
+    with multiprocessing.Pool(processes=number_processes, initializer=_init_pool_worker,
+                              initargs=(logger,)) as pool:
+        for result in pool.imap_unordered(worker, list_systems, chunksize=chunk_size):
+            system_count += 1
+            progress_bar_show(system_count)
+            yield result
+
+
+def _init_pool_worker(parent_logger):
+    """Routes the log messages of a pool worker to the handlers of the parent logger.
+
+    Under spawn/forkserver the worker re-imports its modules, whose ``logger`` is loguru's
+    default stderr logger. The picklable parent logger carries the enqueued file sink, so its
+    core is adopted by the shared loguru logger used by every module of the package.
+
+    Args:
+        parent_logger: Logger of the parent process (configured by init_logger)
+    """
+    logger._core = parent_logger._core
+
+
 
 def order_dict_by_list(dict_data: dict, order_list: list) -> dict:
     """Orders a dictionary's keys based on a predefined list.
@@ -257,6 +339,8 @@ def order_dict_by_list(dict_data: dict, order_list: list) -> dict:
         >>> order_dict_by_list(data, order)
         {'a': 1, 'b': 2, 'c': 3}
     """
+    # Set membership keeps the second pass linear instead of scanning order_list for every key
+    order_set = set(order_list)
     return {key: dict_data[key] for key in order_list if key in dict_data} | {
-        key: dict_data[key] for key in dict_data if key not in order_list
+        key: dict_data[key] for key in dict_data if key not in order_set
     }
\ No newline at end of file
@@ -10,6 +10,7 @@ Date: 08/2024
 """
 
 import os
+from pathlib import Path
 
 import numpy as np
 
@@ -25,7 +26,7 @@ def read_doscar(doscar_file):
     the associated POSCAR file to properly interpret atomic contributions.
 
     Args:
-        doscar_file (str): Path to the DOSCAR file to be read.
+        doscar_file (str | Path): Path to the DOSCAR file to be read.
 
     Returns:
         tuple: A tuple containing:
@@ -41,8 +42,8 @@ def read_doscar(doscar_file):
         FileNotFoundError: If the DOSCAR file doesn't exist.
         ValueError: If file format is unexpected or inconsistent.
     """
-    # Get directory containing DOSCAR file for POSCAR lookup
-    _SIM_FOLDER_PATH = os.path.dirname(doscar_file)
+    # POSCAR of the same simulation folder, resolved once as a Path
+    path_poscar = Path(doscar_file).with_name('POSCAR')
 
     # Verify file exists before attempting to read
     if os.path.isfile(doscar_file):
@@ -72,38 +73,28 @@ def read_doscar(doscar_file):
             integrated_DOS.append(np.float64(content[2]))
 
         # Read POSCAR to get ion counts for parsing atom-resolved DOS
-        poscar = os.path.join(_SIM_FOLDER_PATH, 'POSCAR')
-        poscar_obj = ReadPOSCAR(poscar)
+        poscar_obj = ReadPOSCAR(path_poscar)
         POSCAR_IONS_PER_SPECIES = poscar_obj.get_ions()
         POSCAR_TOTAL_IONS = poscar_obj.get_total_species()
 
         # Process orbital-projected DOS for each atom
+        # Lines are converted while streamed, so no raw-string copy of the tables is kept in memory
         index_table = 0
-        tables_orbitals_dos = [[] for _ in range(int(POSCAR_TOTAL_IONS))]
+        orbitals_table = [[] for _ in range(int(POSCAR_TOTAL_IONS))]
         # Iterate through each atom type and each atom
         for quantity in POSCAR_IONS_PER_SPECIES:
             for j in range(int(quantity)):
                 # Skip header line for each atom's DOS section
-                doscar.readline().strip()  # N/A EMAX, EMIN, NEDOS, EFERMI, WEIGHT
-                tables_orbitals_dos[index_table] = []
-                # Read all DOS points for current atom
-                for i in range(1, _NUM_DOS_LINES):
-                    line = doscar.readline().strip()
-                    tables_orbitals_dos[index_table].append(line)
+                doscar.readline()  # N/A EMAX, EMIN, NEDOS, EFERMI, WEIGHT
+                # Read all DOS points for current atom, keeping orbital data (excluding energy column)
+                orbitals_table[index_table] = [
+                    [np.float64(num) for num in doscar.readline().split()[1:]]
+                    for _ in range(1, _NUM_DOS_LINES)
+                ]
                 index_table += 1
 
         doscar.close()
 
-        # Convert string data to numerical values for orbital tables
-        converted_orbitals_table = [[] for _ in range(index_table)]
-        for i in range(index_table):
-            converted_orbitals_table[i] = [[np.float64(num) for num in line.split()] for line in tables_orbitals_dos[i]]
-
-        # Extract orbital data (excluding energy column)
-        orbitals_table = [[] for _ in range(index_table)]
-        for i in range(index_table):
-            orbitals_table[i] = [line[1:] for line in converted_orbitals_table[i]]
-
         return (energy, fermi_energy_delta, dos, integrated_DOS, orbitals_table, index_table,
                 POSCAR_IONS_PER_SPECIES)
 
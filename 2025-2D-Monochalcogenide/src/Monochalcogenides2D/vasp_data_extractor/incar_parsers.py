@@ -9,8 +9,8 @@ Email: murbach@df.ufscar.br
 Date: 08/2024
 """
 
-import os
 import sys
+from pathlib import Path
 
 
 def read_incar(path_file):
@@ -29,15 +29,13 @@ def read_incar(path_file):
     Raises:
         SystemExit: If the specified file does not exist.
     """
-    # Validate file existence before attempting to read
-    if not os.path.isfile(path_file):
+    # Read file contents in one operation; a missing file is reported by the read itself
+    try:
+        lines_incar = Path(path_file).read_text().splitlines()
+    except (FileNotFoundError, IsADirectoryError):
         sys.exit(f'File: {path_file} does not exist')
-
-    # Read and clean file contents in one operation
-    with open(path_file, 'r') as incar_file:
-        lines_incar = incar_file.readlines()
-        # Remove whitespace and filter out empty lines
-        lines_incar = [line.strip() for line in lines_incar if line.strip()]
+    # Remove whitespace and filter out empty lines
+    lines_incar = [line.strip() for line in lines_incar if line.strip()]
 
     return lines_incar
 
@@ -59,12 +57,8 @@ def create_incar_dict_flags(path_file):
     Raises:
         SystemExit: If the specified file does not exist.
     """
-    # Validate file existence before processing
-    if not os.path.isfile(path_file):
-        sys.exit(f'File: {path_file} does not exist')
-    
     dict_flags_incar = {}
-    # Get cleaned lines from INCAR file
+    # Get cleaned lines from INCAR file (exits if the file does not exist)
     lines_incar = read_incar(path_file)
     
     # Process each line to extract parameters, ignoring comments
@@ -118,11 +112,8 @@ def dict_to_pattern_incar(dict_incar: dict) -> str:
         >>> dict_to_pattern_incar({'EDIFF': '1e-6', 'NSW': '500'})
         "EDIFF = 1e-6\nNSW = 500\n"
     """
-    pattern_string = ''
-    # Rebuild INCAR format from dictionary entries
-    for key, value in dict_incar.items():
-        pattern_string += f'{key} = {value}\n'
-    return pattern_string
+    # Rebuild INCAR format from dictionary entries (joined once, no repeated string reallocation)
+    return ''.join(f'{key} = {value}\n' for key, value in dict_incar.items())
 
 
 def create_incar_file_from_dict(path_file, incar_dict_flags: dict):
@@ -143,5 +134,4 @@ def create_incar_file_from_dict(path_file, incar_dict_flags: dict):
     # Convert dictionary to INCAR format string
     lines_incar_file = dict_to_pattern_incar(incar_dict_flags)
     # Write complete content to file
-    with open(path_file, 'w') as incar_file:
-        incar_file.writelines(lines_incar_file)
\ No newline at end of file
+    Path(path_file).write_text(lines_incar_file)
\ No newline at end of file
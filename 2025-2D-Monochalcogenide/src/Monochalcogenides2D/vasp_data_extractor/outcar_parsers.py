@@ -13,6 +13,14 @@ import mmap
 import os
 import re
 
+# Grid dimension line of the OUTCAR (e.g. "   dimension x,y,z NGXF=    64 NGYF=   64 NGZF=  128")
+_PATTERN_NUMBER_GRID = re.compile(
+    rb' {3}dimension x,y,z NGXF=\s*(\d+)\s+NGYF=\s*(\d+)\s+NGZF=\s*(\d+)'
+)
+# Literal part of the grid dimension line, located with mmap.find before any regex work
+_MARKER_NUMBER_GRID = b'dimension x,y,z NGXF='
+
+
 def read_outcar_map(path_outcar):
     """
     Creates a memory-mapped view of an OUTCAR file for efficient large file reading.
@@ -34,8 +42,6 @@ def read_outcar_map(path_outcar):
     """
     # Open file in binary mode for memory mapping
     with open(path_outcar, 'rb') as OUTCAR_M:
-        # Read entire file content (optional, not used later)
-        content_file_m = OUTCAR_M.read()
         # Create memory map for efficient large file access
         file_map_m = mmap.mmap(OUTCAR_M.fileno(), 0, access=mmap.ACCESS_READ)
     return file_map_m
@@ -67,29 +73,23 @@ def get_number_grid(path_outcar):
     if os.path.exists(path_outcar):
         # Create memory-mapped view of OUTCAR file for efficient searching
         outcar_file_map = read_outcar_map(path_outcar)
-        
-        # Compile pattern to locate grid dimension information in file
-        pattern_search = re.compile(b' {3}dimension x,y,z NGXF')
-        
-        # Search for pattern in memory-mapped file
-        for result in pattern_search.finditer(outcar_file_map):
-            start_r = result.start()
-            end_r = result.end()
 
-            # Extract the complete line containing the grid dimension information
-            line_start = outcar_file_map.rfind(b'\n', 0, start_r) + 1
-            line_end = outcar_file_map.find(b'\n', end_r)
-            line_string = outcar_file_map[line_start:line_end].decode('utf-8')
-            
-            # Compile patterns to extract individual grid dimension values
-            ngxf_line_fetch = re.compile(r'(NGXF=)([\r\n\t\f\v ]+)(\d{1,3})')
-            ngyf_line_fetch = re.compile(r'(NGYF=)([\r\n\t\f\v ]+)(\d{1,3})')
-            ngzf_line_fetch = re.compile(r'(NGZF=)([\r\n\t\f\v ]+)(\d{1,3})')
-            
-            # Extract each grid dimension value using regex patterns
-            ngxf_string = re.search(ngxf_line_fetch, line_string)
-            ngyf_string = re.search(ngyf_line_fetch, line_string)
-            ngzf_string = re.search(ngzf_line_fetch, line_string)
-            
+        with outcar_file_map:
+            # Locate the grid line with a plain substring find and parse only that line
+            index_grid = outcar_file_map.find(_MARKER_NUMBER_GRID)
+            # The marker is part of the pattern, so without it the regex cannot match either
+            if index_grid < 0:
+                return None
+            line_start = outcar_file_map.rfind(b'\n', 0, index_grid) + 1
+            line_end = outcar_file_map.find(b'\n', index_grid)
+            result = _PATTERN_NUMBER_GRID.match(
+                outcar_file_map[line_start:line_end if line_end >= 0 else len(outcar_file_map)]
+            )
+            # Fall back to a regex sweep from the marker line if the line has an unexpected layout
+            if result is None:
+                result = _PATTERN_NUMBER_GRID.search(outcar_file_map, line_start)
+            # Groups are decoded while the map is still open: a match from the fallback sweep points into it
+            number_grid = tuple(value.decode('utf-8') for value in result.groups()) if result else None
+        if number_grid:
             # Return the three grid dimension values
-            return ngxf_string.group(3), ngyf_string.group(3), ngzf_string.group(3)
\ No newline at end of file
+            return number_grid
\ No newline at end of file
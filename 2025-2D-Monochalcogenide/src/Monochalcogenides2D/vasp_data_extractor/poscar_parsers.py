@@ -10,9 +10,10 @@ Date: 08/2024
 """
 
 import os
+from pathlib import Path
 
 import numpy as np
-from ase import Atom, Atoms
+from ase import Atoms
 
 
 class ReadPOSCAR(object):
@@ -25,11 +26,11 @@ class ReadPOSCAR(object):
     Atoms object for compatibility with atomic simulation environments.
 
     Args:
-        poscar_path (str): Path to the POSCAR file to be parsed.
+        poscar_path (str | os.PathLike): Path to the POSCAR file to be parsed.
 
     Raises:
         FileNotFoundError: If the specified POSCAR file does not exist.
-        TypeError: If the provided path is not a string.
+        TypeError: If the provided path is not a string or path-like object.
 
     Attributes:
         get_ions_positions(): Returns parsed atomic positions.
@@ -51,9 +52,9 @@ class ReadPOSCAR(object):
         self._system_description = None  # line 1 - to line 1
         self._scaling_factor = None  # line 2 - to line 2
         self._lattice_vectors = []  # line 3 - to line 5
-        self._ions_per_species = []  # line (6,7) - to line (6,7)
+        self._ions_per_species = np.empty(0, dtype=np.int64)  # line (6,7) - to line (6,7)
         self._coordinates_mode = None  # line (7, 8, 9) - to line (7, 8,9)
-        self._list_ions_positions = []  # line (8, 9, 10) - to line (8+n, 9+n, 10+n)
+        self._list_ions_positions = np.empty((0, 3), dtype=np.float64)  # line (8, 9, 10) - to line (8+n, 9+n, 10+n)
         # Optional
         self._list_ions_positions_flag = []
         self._species_name = []  # line 6 - to line 6
@@ -65,29 +66,17 @@ class ReadPOSCAR(object):
         # Control
         self._total_species = 0
         self._line_ions_per_species = 0
-        self._type_coordinates_mode = [
-            'cartesian', 'direct'
-        ]
+        self._line_coordinates_mode = 0
         self._atoms = Atoms()
 
-        self._structure_file = {
-            1: lambda number, content: self.__set_value('_system_description', number, content),
-            2: lambda number, content: self.__set_value('_scaling_factor', number, content),
-            3: lambda number, content: self.__set_lattice_vector(number, content),
-            4: lambda number, content: self.__set_lattice_vector(number, content),
-            5: lambda number, content: self.__set_lattice_vector(number, content),
-            6: lambda number, content: self.__process_line_content_ions_information(number, content),
-            7: lambda number, content: self.__process_line_content_ions_information(number, content),
-        }
-
-        if isinstance(poscar_path, str):
+        if isinstance(poscar_path, (str, os.PathLike)):
             if os.path.isfile(poscar_path):
                 self._poscar_path = poscar_path
                 self.read_file()
             else:
                 raise FileNotFoundError(f"The file '{poscar_path}' does not exist.")
         else:
-            raise TypeError("The 'poscar_path' must be a string.")
+            raise TypeError("The 'poscar_path' must be a string or path-like object.")
 
     def get_ions_positions(self):
         return self._list_ions_positions
@@ -115,7 +104,7 @@ class ReadPOSCAR(object):
         return data
 
     def __process_line_content_modes_coordinates(self, line_number, value):
-        if len(value) > 0 and (value[0] == 'S' or value[0] == 's'):
+        if value.startswith(('S', 's')):
             self._selective_dynamics = True
 
     def __process_line_content_ions_information(self, line_number, value):
@@ -129,19 +118,17 @@ class ReadPOSCAR(object):
                 else:
                     # print('The names of the chemical species have not been provided.')
                     safe_element_name = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']
-                    j = 0
-                    for species in parts:
-                        self._total_species += int(species)
-                        self._line_ions_per_species = line_number
-                        self._ions_per_species.append(species)
-                        self._species_name.append(safe_element_name[j])
-                        j += 1
+                    self.__set_ions_per_species(line_number, parts)
+                    self._species_name.extend(safe_element_name[:len(parts)])
             elif line_number == 7:
                 if parts[0].isdigit():
-                    for species in parts:
-                        self._total_species += int(species)
-                        self._line_ions_per_species = line_number
-                        self._ions_per_species.append(species)
+                    self.__set_ions_per_species(line_number, parts)
+
+    def __set_ions_per_species(self, line_number, parts):
+        # Counts are converted once here, so consumers get integers instead of strings
+        self._ions_per_species = np.array(parts, dtype=np.int64)
+        self._total_species = int(self._ions_per_species.sum())
+        self._line_ions_per_species = line_number
 
     def __set_lattice_vector(self, line_number, value):
         parts = value.strip().split()
@@ -150,85 +137,75 @@ class ReadPOSCAR(object):
             axis_line.append(self.__format_float_values(axis))
         self._lattice_vectors.append(axis_line)
 
-    def __set_value(self, name, line_number, value):
-        if hasattr(self, name):
-            if name == '_scaling_factor':
-                setattr(self, name, self.__format_float_values(value))
-            else:
-                setattr(self, name, value.strip())
-        else:
-            print(f"The variable '{name}' doesn't exist")
-
     @staticmethod
     def __format_float_values(value):
+        # float64 parsing already round-trips exactly; no need to format and re-parse the value
         try:
-            return np.float64(np.format_float_positional(np.float64(value), precision=16, unique=True, min_digits=16))
-        except Exception as e:
+            return np.float64(value)
+        except ValueError as e:
             print(f'Error: {e}')
             return value
 
     def __set_selective_dynamics(self, line_number, value):
         value = value.strip()
-        if value[0] == 'S' or value[0] == 's':
+        if value.startswith(('S', 's')):
             self._selective_dynamics = True
+            # The coordinates mode comes right after the 'selective dynamics' line
+            self._line_coordinates_mode = line_number + 1
         else:
             self._coordinates_mode = value
+            self._line_coordinates_mode = line_number
 
     def __set_coordinates_mode(self, line_number, value):
         value = value.strip()
         self._coordinates_mode = value
 
-    def __set_ions_positions(self, line_number, positions):
-        formatted_positions = positions.split()
-        positions = [
-            self.__format_float_values(formatted_positions[0]),
-            self.__format_float_values(formatted_positions[1]),
-            self.__format_float_values(formatted_positions[2])
-        ]
-        self._list_ions_positions.append(positions)
+    def __set_ions_positions(self, position_lines):
+        if not position_lines:
+            return
+        # Bulk conversion of the whole position block: (N, 3) float64 array in a single C-level pass
+        self._list_ions_positions = np.loadtxt(position_lines, dtype=np.float64, usecols=(0, 1, 2), ndmin=2)
         if self._selective_dynamics:
-            positions_flag = [
-                formatted_positions[3],
-                formatted_positions[4],
-                formatted_positions[5]
-            ]
-            self._list_ions_positions_flag.append(positions_flag)
+            self._list_ions_positions_flag = [line.split()[3:6] for line in position_lines]
 
     def read_file(self):
-        try:
-            with open(self._poscar_path, "r") as POSCAR:
-                for line_number, line_content in enumerate(POSCAR, start=1):
-                    if line_content.strip() == '':
-                        break
+        # Position lines are collected and converted together once the file has been read
+        position_lines = []
+        # POSCAR files are small: a single read avoids the per-line iterator of the file object
+        lines_poscar = Path(self._poscar_path).read_text().splitlines()
+        for line_number, line_content in enumerate(lines_poscar, start=1):
+            if line_content.strip() == '':
+                break
+            else:
+                formatted_line_content = line_content.strip()
+                # print(f'Line {line_number}: {formatted_line_content}')
+                if self._line_ions_per_species == 0:
+                    # Fixed-size header (lines 1-7): explicit dispatch on the line number
+                    if line_number == 1:
+                        self._system_description = formatted_line_content
+                    elif line_number == 2:
+                        self._scaling_factor = self.__format_float_values(line_content)
+                    elif 3 <= line_number <= 5:
+                        self.__set_lattice_vector(line_number, line_content)
+                    elif line_number in (6, 7):
+                        self.__process_line_content_ions_information(line_number, line_content)
+                else:
+                    # The line containing 'selective dynamics' must necessarily come after the information about
+                    # ions per species.
+                    if line_number == (self._line_ions_per_species + 1):
+                        self.__set_selective_dynamics(line_number, line_content)
+                    elif line_number == self._line_coordinates_mode:
+                        self.__set_coordinates_mode(line_number, line_content)
                     else:
-                        formatted_line_content = line_content.strip()
-                        # print(f'Line {line_number}: {formatted_line_content}')
-                        if self._line_ions_per_species == 0:
-                            if line_number in self._structure_file:
-                                self._structure_file[line_number](line_number, line_content)
-                        else:
-                            # The line containing 'selective dynamics' must necessarily come after the information about
-                            # ions per species.
-                            if line_number == (self._line_ions_per_species + 1):
-                                self.__set_selective_dynamics(line_number, line_content)
-                            else:
-                                if formatted_line_content.lower() in self._type_coordinates_mode:
-                                    self.__set_coordinates_mode(line_number, line_content)
-                                else:
-                                    self.__set_ions_positions(line_number, line_content)
-        except Exception as e:
-            print("An error occurred while reading the file:", e)
+                        position_lines.append(line_content)
+        self.__set_ions_positions(position_lines)
 
     def create_atoms(self):
-        index_atom = 0
-        for i in range(len(self._species_name)):
-            symbol = self._species_name[i]
-            for j in range(int(self._ions_per_species[i])):
-                created_atom = Atom(
-                    symbol,
-                    self._list_ions_positions[index_atom]
-                )
-                self._atoms.append(created_atom)
-                index_atom += 1
-
-        self._atoms.set_cell(self._lattice_vectors)
+        # One symbol per ion, in the same order as the position block
+        symbols = np.repeat(self._species_name, self._ions_per_species).tolist()
+        # Single constructor call instead of appending Atom objects one by one
+        self._atoms = Atoms(
+            symbols=symbols,
+            positions=np.asarray(self._list_ions_positions)[:len(symbols)],
+            cell=self._lattice_vectors
+        )
@@ -32,5 +32,6 @@ def plot_dos_soc(path_simulation_folder: Path, filename: str) -> None:
     print(f"Energy range: {energy[0]} to {energy[-1]} eV")
 
 
-path_sim = Path('/home/murbach/Documents/UResearch/Projects/2024_2D_Monochalcogenides/Simulations/Results/Raw_Outputs/DensityOfStatesStudy/SOCMQLowestEnergy/AlS/P6m2')
-plot_dos_soc(path_sim, 'dos_soc_plot.png')
\ No newline at end of file
+if __name__ == "__main__":
+    path_sim = Path('/home/murbach/Documents/UResearch/Projects/2024_2D_Monochalcogenides/Simulations/Results/Raw_Outputs/DensityOfStatesStudy/SOCMQLowestEnergy/AlS/P6m2')
+    plot_dos_soc(path_sim, 'dos_soc_plot.png')
\ No newline at end of file
@@ -9,8 +9,9 @@ Email: murbach@df.ufscar.br
 Date: 08/2024
 """
 
-import mmap
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
 from Monochalcogenides2D.common.config import (PATH_FILE_INCAR_PATTERN, PATH_FOLDER_POTPAW,
@@ -18,6 +19,15 @@ from Monochalcogenides2D.common.config import (PATH_FILE_INCAR_PATTERN, PATH_FOL
 
 from Monochalcogenides2D.common.utils import task_generate_log, return_data_formatted_titel, init_logger
 
+# POTCAR header tags in a single alternation, compiled once at import
+# Group 1: ENMAX value, group 2: ZVAL value; a match with neither group set is the TITEL tag
+_PATTERN_POTCAR_TAGS = re.compile(rb'TITEL|ENMAX\s*=\s*(\d+\.\d+)|ZVAL\s*=\s*(\d+\.\d+)')
+# Date stamp of the TITEL line (e.g., '06Sep2000')
+_PATTERN_TITEL_DATE = re.compile(r'(\d{1,}[A-z]{3}\d{1,})')
+
+# POTPAW folder suffix per element; elements not listed use the standard '_GW' suffix
+_POTCAR_FOLDER_SUFFIX = {element: '_d_GW' for element in LIST_ELEMENT_POTCAR_D_GW}
+
 
 @task_generate_log
 def run_write_incar(folder_output: Path, mq: list):
@@ -58,44 +68,45 @@ def run_write_incar(folder_output: Path, mq: list):
         raise
     
     # Determine ENCUT using highest element ENMAX with safety factor
-    # Note: Uses same value when ENMAX are equal for consistency
-    if enmax_m > enmax_q:
-        incar_encut = enmax_m * RATIO_FACTOR
-    elif enmax_q > enmax_m:
-        incar_encut = enmax_q * RATIO_FACTOR
-    else:
-        incar_encut = enmax_m * RATIO_FACTOR
-
-    # Load template INCAR file lines for modification
-    incar_template = PATH_FILE_INCAR_PATTERN.read_text(encoding='utf-8').splitlines()
+    incar_encut = max(enmax_m, enmax_q) * RATIO_FACTOR
+
+    # Load template INCAR file lines for modification (read from disk only once per process)
+    incar_template = _load_incar_template()
     
-    # Combine POTCAR contents and write to output file
+    # Write both POTCAR contents to the output file back to back
     # Order matters: First element (M) then second element (Q)
-    content_file_potcar = content_file_m + content_file_q
-    potcar_output.write_bytes(content_file_potcar)
+    # Two writes on the same handle avoid building a concatenated copy of both files
+    with open(potcar_output, 'wb') as potcar_file:
+        potcar_file.write(content_file_m)
+        potcar_file.write(content_file_q)
     logger.info(f"POTCAR file created successfully at {potcar_output.resolve()}")
     
     # Modify template INCAR lines with system-specific parameters
     logger.info("Altering INCAR file...")
-    incar_lines_content = []
-    for line_number, lines in enumerate(incar_template, start=1):
-        # Line 1: Add material system comment header
-        if line_number == 1:
-            new_line = "#SYSTEM " + mq[0] + " " + mq[1] + " - (auto generated INCAR)\n"
-            incar_lines_content.append(new_line)
-        # Line 4: Insert calculated ENCUT value
-        elif line_number == 4:
-            new_line = "ENCUT   =   " + str(incar_encut) + "\n"
-            incar_lines_content.append(new_line)
-        # Preserve all other template lines unchanged
-        else:
-            incar_lines_content.append(lines)
-
-    # Write cleaned INCAR lines to output file
-    cleaned_lines_incar = [line.strip('\n') for line in incar_lines_content]
-    incar_output.write_text('\n'.join(cleaned_lines_incar), encoding='utf-8')
+    # Copy of the cached template with only the two system-specific lines replaced
+    incar_lines_content = list(incar_template)
+    # Line 1: Add material system comment header
+    incar_lines_content[0] = "#SYSTEM " + mq[0] + " " + mq[1] + " - (auto generated INCAR)"
+    # Line 4: Insert calculated ENCUT value
+    incar_lines_content[3] = "ENCUT   =   " + str(incar_encut)
+
+    # Lines are built without line breaks, so they are joined and written in a single call
+    incar_output.write_text('\n'.join(incar_lines_content), encoding='utf-8')
     logger.info(f"INCAR file written to {incar_output.resolve()}")
 
+@lru_cache(maxsize=None)
+def _load_incar_template() -> tuple:
+    """Loads and caches the template INCAR lines.
+
+    The same template is used for every material system, so it is read from
+    disk once and reused by all run_write_incar calls.
+
+    Returns:
+        tuple: Lines of the template INCAR file (without line breaks)
+    """
+    return tuple(PATH_FILE_INCAR_PATTERN.read_text(encoding='utf-8').splitlines())
+
+
 @task_generate_log
 def potpaw_folder_for_element(element: str) -> Path:
     """Finds the appropriate POTCAR folder path for a given element.
@@ -119,17 +130,13 @@ def potpaw_folder_for_element(element: str) -> Path:
         >>> potpaw_folder_for_element('Fe')
         Path('/pseudopotentials/Fe_d_GW/POTCAR')
     """
-    # List all directories in the main POTPAW folder
+    # Directories available in the main POTPAW folder (listed once per process)
     # Critical: Identifies available element pseudopotential versions
-    potcar_list_folders = [folder.name for folder in PATH_FOLDER_POTPAW.iterdir() if folder.is_dir()]
-    
-    # Default folder naming convention for standard elements
-    folder_element_name = f"{element}_GW"
+    potcar_list_folders = _potpaw_folders()
 
-    # Special handling for elements requiring d-electron treatment
+    # Folder naming convention: '_GW' by default, '_d_GW' for elements requiring d-electron treatment
     # Note: LIST_ELEMENT_POTCAR_D_GW contains elements needing '_d_GW' suffix
-    if element in LIST_ELEMENT_POTCAR_D_GW:
-        folder_element_name = f"{element}_d_GW"
+    folder_element_name = element + _POTCAR_FOLDER_SUFFIX.get(element, '_GW')
 
     # Verify the determined folder exists in available directories
     # Critical: Ensures valid POTCAR path before returning
@@ -137,13 +144,31 @@ def potpaw_folder_for_element(element: str) -> Path:
         return PATH_FOLDER_POTPAW.joinpath(folder_element_name, "POTCAR")
 
 
+@lru_cache(maxsize=None)
+def _potpaw_folders() -> frozenset:
+    """Lists and caches the element folders of the POTPAW directory.
+
+    The folder listing does not change during a run, so the directory is read
+    once and the set is reused for every element lookup.
+
+    Returns:
+        frozenset: Names of the subdirectories of PATH_FOLDER_POTPAW
+    """
+    # scandir reports the entry type from the directory read itself, without one stat call per entry
+    with os.scandir(PATH_FOLDER_POTPAW) as entries:
+        return frozenset(entry.name for entry in entries if entry.is_dir())
+
+
 # @task_generate_log
+@lru_cache(maxsize=None)
 def get_potcar_info(element: str) -> str:
     """Retrieves POTCAR file metadata and content for a specified element.
 
     Reads pseudopotential file for given element, extracts key parameters
     (TITEL, date, ENMAX, ZVAL) and returns both metadata and file content.
-    Uses memory-mapping for efficient parsing of large POTCAR files.
+    The file is read once and the same bytes are used for parsing and for
+    the POTCAR reassembly. Results are memoized per element, so each POTCAR
+    is located, read and parsed only once per process.
 
     Args:
         element: Chemical symbol of target element (e.g., 'Si', 'O')
@@ -169,34 +194,28 @@ def get_potcar_info(element: str) -> str:
     # Critical: Depends on external path resolution logic
     path_potcar_element = potpaw_folder_for_element(element)
 
-    # Read POTCAR content and create memory map for efficient parsing
-    # Why: mmap enables large file handling without full loading
+    # Read POTCAR content once
+    # Why: The full content is needed for POTCAR reassembly, so a separate memory map would only duplicate it
     with open(path_potcar_element, 'rb') as potcar_file:
-        # Store raw content for POTCAR reassembly
         content_file = potcar_file.read()
-        # Create read-only memory map for metadata extraction
-        file_map = mmap.mmap(potcar_file.fileno(), 0, access=mmap.ACCESS_READ)
 
-    # Extract key pseudopotential parameters from memory-mapped file
+    # Extract key pseudopotential parameters from the same bytes
     # Note: search_potcar_files contains parsing logic for VASP format
-    titel, date_potcar, enmax, zval = search_potcar_files(file_map)
-
-    # Release memory map resources immediately after use
-    file_map.close()
+    titel, date_potcar, enmax, zval = search_potcar_files(content_file)
 
     return titel, date_potcar, enmax, zval, content_file
 
 
-@task_generate_log
+# @task_generate_log
 def search_potcar_files(file_map):
     """Extracts key metadata from POTCAR files using regex pattern matching.
 
-    Parses memory-mapped POTCAR files to retrieve critical pseudopotential parameters:
+    Parses POTCAR file contents to retrieve critical pseudopotential parameters:
     TITEL descriptor, creation date, ENMAX cutoff energy, and ZVAL electron count.
-    Uses efficient memory mapping and line extraction for large file handling.
+    Works on any bytes-like buffer (bytes or mmap) with a single scan for the three tags.
 
     Args:
-        file_map: Memory-mapped pseudopotential file object (mmap)
+        file_map: Pseudopotential file contents (bytes or mmap)
 
     Returns:
         tuple: (titel_line, formatted_titel, enmax_value, zval_value) containing:
@@ -210,69 +229,39 @@ def search_potcar_files(file_map):
         UnicodeDecodeError: If binary-to-text conversion fails
 
     Example:
-        >>> with open('POTCAR', 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-        >>>     search_potcar_files(mm)
+        >>> search_potcar_files(Path('POTCAR').read_bytes())
         ('PAW_PBE Fe 06Sep2000', 'Fe', 268.2, 8.0)
     """
-    # Pre-compile byte patterns for efficient searching
-    # Why: Avoid recompiling patterns during file scanning
-    pattern_search_titel = re.compile(b'TITEL')
-    pattern_search_enmax = re.compile(b'ENMAX')
-    pattern_search_zval = re.compile(b'ZVAL')
-
     # Initialize return values to handle missing data cases
     string_titel, data_titel_file, enmax_float, zval_float = None, None, None, None
 
-    # Extract TITEL line containing elemental descriptor
-    # Critical: Identifies pseudopotential type and version
-    for result in pattern_search_titel.finditer(file_map):
-        start_r = result.start()
-        end_r = result.end()
-
-        # Isolate full line containing the TITEL marker
-        line_start = file_map.rfind(b'\n', 0, start_r) + 1
-        line_end = file_map.find(b'\n', end_r)
-        string_titel = file_map[line_start:line_end].decode('utf-8')
-        
-        # Extract and format elemental identifier (e.g., '12Fe3' -> 'Fe')
-        data_file_search = re.compile(r'(\d{1,}[A-z]{3}\d{1,})')
-        data_string = re.search(data_file_search, string_titel)
-        data_potcat = data_string.group(1)
-        data_titel_file = return_data_formatted_titel(data_potcat)
-
-    # Retrieve ENMAX value - critical for energy cutoff calculations
-    # Why: Determines basis set size in DFT simulations
-    for result in pattern_search_enmax.finditer(file_map):
-        start_r = result.start()
-        end_r = result.end()
-
-        # Extract full ENMAX parameter line
-        line_start = file_map.rfind(b'\n', 0, start_r) + 1
-        line_end = file_map.find(b'\n', end_r)
-        string_enmax = file_map[line_start:line_end].decode('utf-8')
-        
-        # Capture floating-point value after ENMAX marker
-        enmax_search_value = r'ENMAX\s*=\s*(\d+.\d+)'
-        enmax_values = re.search(enmax_search_value, string_enmax)
-        if enmax_values:
-            enmax_float = float(enmax_values.group(1))
-
-    # Extract ZVAL (valence electron count)
-    # Why: Essential for charge neutrality calculations
-    for result in pattern_search_zval.finditer(file_map):
-        start_r = result.start()
-        end_r = result.end()
-        
-        # Isolate full ZVAL parameter line
-        line_start = file_map.rfind(b'\n', 0, start_r) + 1
-        line_end = file_map.find(b'\n', end_r)
-        string_zval = file_map[line_start:line_end].decode('utf-8')
-        
-        # Capture floating-point value after ZVAL marker
-        zval_search_value = r'ZVAL\s*=\s*(\d+.\d+)'
-        zval_values = re.search(zval_search_value, string_zval)
-        if zval_values:
-            zval_float = float(zval_values.group(1))
+    # Single pass over the buffer for the three tags
+    # Why: All tags sit in the POTCAR header, so the scan stops as soon as the three are found
+    for result in _PATTERN_POTCAR_TAGS.finditer(file_map):
+        if result.group(1) is not None:
+            # Retrieve ENMAX value - critical for energy cutoff calculations
+            # Why: Determines basis set size in DFT simulations
+            if enmax_float is None:
+                enmax_float = float(result.group(1))
+        elif result.group(2) is not None:
+            # Extract ZVAL (valence electron count)
+            # Why: Essential for charge neutrality calculations
+            if zval_float is None:
+                zval_float = float(result.group(2))
+        elif string_titel is None:
+            # Extract TITEL line containing elemental descriptor
+            # Critical: Identifies pseudopotential type and version
+            line_start = file_map.rfind(b'\n', 0, result.start()) + 1
+            line_end = file_map.find(b'\n', result.end())
+            string_titel = file_map[line_start:line_end].decode('utf-8')
+
+            # Extract and format elemental identifier (e.g., '12Fe3' -> 'Fe')
+            data_string = _PATTERN_TITEL_DATE.search(string_titel)
+            data_potcat = data_string.group(1)
+            data_titel_file = return_data_formatted_titel(data_potcat)
+
+        if string_titel is not None and enmax_float is not None and zval_float is not None:
+            break
 
     return string_titel, data_titel_file, enmax_float, zval_float
 
@@ -9,13 +9,51 @@ Email: murbach@df.ufscar.br
 Date: 08/2024
 """
 import re
-from itertools import islice
+from functools import lru_cache
 from pathlib import Path
 import numpy as np
-from Monochalcogenides2D.common.config import (PATH_FOLDER_POSCAR_PATTERN, NAME_FILE_POSCAR_PATTERN,
-                    POSCAR_LINES_TO_MODIFY)
+from Monochalcogenides2D.common.config import PATH_FOLDER_POSCAR_PATTERN, NAME_FILE_POSCAR_PATTERN
 from Monochalcogenides2D.common.utils import task_generate_log, return_data_formatted_titel, init_logger
 
+# Numeric identifiers in the template title line (e.g., "4" in "Na4"), compiled once at import
+_PATTERN_DIGITS = re.compile(r"(\d+)")
+
+
+@lru_cache(maxsize=None)
+def _load_poscar_template(space_group: str) -> tuple:
+    """Loads and caches the template POSCAR of a space group.
+
+    Every material of a space group shares the same template, so the file is
+    read and its title numbers extracted only once per space group.
+
+    Args:
+        space_group: Space group identifier for template selection
+
+    Returns:
+        tuple: (template_lines, numbers) with the template lines and the numeric
+            identifiers of the title line, both as tuples
+
+    Raises:
+        FileNotFoundError: If template POSCAR file is missing
+        ValueError: If the template title line lacks the element counts
+    """
+    # Validate template file existence before processing
+    # Critical: Required for POSCAR generation workflow
+    path_poscar_template = PATH_FOLDER_POSCAR_PATTERN.joinpath(space_group, NAME_FILE_POSCAR_PATTERN)
+    if not path_poscar_template.exists():
+        logger.error(f"Template POSCAR not found at {path_poscar_template.resolve()}")
+        raise FileNotFoundError(f"Template POSCAR not found at {path_poscar_template.resolve()}")
+
+    # Read template lines for modification
+    template_lines = path_poscar_template.read_text(encoding='utf-8').splitlines()
+
+    # Extract numeric identifiers from the template title line (e.g., "4" in "Na4")
+    numbers = _PATTERN_DIGITS.findall(template_lines[0]) if template_lines else []
+    if len(numbers) < 2:
+        raise ValueError("Template POSCAR line 1 missing required numbers")
+
+    return tuple(template_lines), tuple(numbers)
+
 @task_generate_log
 def run_write_poscar(path_output_folder: str, list_elements: list, space_group: str):
     """Generates VASP POSCAR file from template with customized chemistry headers.
@@ -32,7 +70,7 @@ def run_write_poscar(path_output_folder: str, list_elements: list, space_group:
         space_group: Space group identifier for template selection
 
     Returns:
-        True on successful file creation, False otherwise
+        True once the file is written (failures raise instead of returning)
 
     Raises:
         FileNotFoundError: If template POSCAR file is missing
@@ -43,63 +81,88 @@ def run_write_poscar(path_output_folder: str, list_elements: list, space_group:
         >>> run_write_poscar('calc_dir', ['Na','Cl'], 'Fm-3m')
         Creates POSCAR in calc_dir with Na-Cl headers
     """
-    # Validate template file existence before processing
-    # Critical: Required for POSCAR generation workflow
-    path_poscar_template = PATH_FOLDER_POSCAR_PATTERN.joinpath(space_group, NAME_FILE_POSCAR_PATTERN)
-    if not path_poscar_template.exists():
-        logger.error(f"Template POSCAR not found at {path_poscar_template.resolve()}")
-        raise FileNotFoundError(f"Template POSCAR not found at {path_poscar_template.resolve()}")
-    
-    # Read template lines for modification
-    template_lines = path_poscar_template.read_text(encoding='utf-8').splitlines()
+    # Template lines and title numbers, read once per space group
+    template_lines, numbers = _load_poscar_template(space_group)
 
     # Extract first two elements for material system
     # Note: VASP convention requires ordered element specification
-    element_m, element_q = list(islice(list_elements, 2))
-
-    # Initialize output buffer with regex for number extraction
-    output_lines = []
-    numbers = None  # To store extracted numbers from line 1
-    pattern = re.compile(r"(\d+)")
-
-    # Process each template line with custom modifications
-    # Why: Only specific lines require element-dependent changes
-    for line_num, line in enumerate(template_lines, start=1):
-        if line_num in POSCAR_LINES_TO_MODIFY:
-            # Line 1: Customize system title with element counts
-            if line_num == 1:
-                # Extract numeric identifiers from template (e.g., "4" in "Na4")
-                numbers = pattern.findall(line)
-                if len(numbers) < 2:
-                    raise ValueError("Template POSCAR line 1 missing required numbers")
-                # Format new title line with elements and extracted counts
-                new_line = f"{element_m}{numbers[0]} {element_q}{numbers[1]} - (auto generated POSCAR)\n"
-                output_lines.append(new_line)
-            # Line 6: Insert element names in VASP-required order
-            elif line_num == 6:
-                output_lines.append(f"{element_m}   {element_q}\n")
-        # Preserve unmodified template lines
-        else:
-            output_lines.append(line)
+    element_m, element_q = list_elements[0], list_elements[1]
+
+    # Copy template lines and replace only the element-dependent ones in place
+    # Why: Only line 1 (system title) and line 6 (element names) require changes
+    output_lines = list(template_lines)
+    # Line 1: Customize system title with element counts
+    output_lines[0] = f"{element_m}{numbers[0]} {element_q}{numbers[1]} - (auto generated POSCAR)"
+    # Line 6: Insert element names in VASP-required order
+    if len(output_lines) >= 6:
+        output_lines[5] = f"{element_m}   {element_q}"
 
     # Write processed content to output file
     try:
         logger.info(f"Writing POSCAR file for {', '.join(map(str, list_elements))}")
-        # Clean line breaks for consistent POSCAR formatting
-        cleaned_lines_poscar = [line.strip('\n') for line in output_lines]
+        # Lines are built without line breaks, so they are joined directly
         path_poscar_file = Path(path_output_folder).joinpath("POSCAR")
-        path_poscar_file.write_text('\n'.join(cleaned_lines_poscar), encoding='utf-8')
+        path_poscar_file.write_text('\n'.join(output_lines), encoding='utf-8')
         logger.info(f"POSCAR file written to {path_poscar_file.resolve()}")
-        # Log final chemical formula for verification
-        if numbers:
-            logger.info(f"Chemistry formula M: {element_m}{numbers[0]} Q: {element_q}{numbers[1]}")
-            logger.info("POSCAR file generated successfully")
-            return True
     except IOError as e:
         logger.error(f"Failed to write POSCAR file: {str(e)}")
         raise IOError(f"Failed to write POSCAR file: {str(e)}") from e
 
-    return False
+    # Log final chemical formula for verification
+    logger.info(f"Chemistry formula M: {element_m}{numbers[0]} Q: {element_q}{numbers[1]}")
+    logger.info("POSCAR file generated successfully")
+    return True
+
+@lru_cache(maxsize=None)
+def get_poscar_template_vectors(space_group: str) -> tuple:
+    """Returns the scaling factor and lattice vectors of a space group template POSCAR.
+
+    Generated POSCAR files keep lines 2-5 of the template unchanged, so the lattice
+    can be taken from the cached template instead of re-reading the written POSCAR.
+
+    Args:
+        space_group: Space group identifier for template selection
+
+    Returns:
+        tuple: (scale, a1, a2, a3) with the same types as read_poscar_vectors;
+            the vectors are read-only arrays shared by all callers
+
+    Raises:
+        FileNotFoundError: If template POSCAR file is missing
+        ValueError: If the lattice lines cannot be parsed
+    """
+    template_lines, _ = _load_poscar_template(space_group)
+    scale, a1, a2, a3 = _parse_lattice(template_lines)
+    # The cached arrays are shared by every caller, so they are made read-only
+    for vector in (a1, a2, a3):
+        vector.setflags(write=False)
+    return scale, a1, a2, a3
+
+
+def _parse_lattice(lines_poscar) -> tuple:
+    """Parses the scaling factor and lattice vectors of POSCAR lines 2-5.
+
+    Args:
+        lines_poscar: POSCAR lines (without line breaks), at least the first 5
+
+    Returns:
+        tuple: (scale, a1, a2, a3) with scale as np.float64 and the vectors as float64 arrays
+
+    Raises:
+        ValueError: If any parsing error occurs
+    """
+    try:
+        # Parse universal scaling factor for lattice vectors
+        scale = np.float64(lines_poscar[1].strip())
+
+        # Parse the 3 lattice vector lines in a single call
+        a1, a2, a3 = np.loadtxt(lines_poscar[2:5], dtype=np.float64)
+        return scale, a1, a2, a3
+
+    # Wrap low-level errors with context about parsing failure
+    except Exception as e:
+        raise ValueError(f"Error reading POSCAR vectors: {str(e)}") from e
+
 
 @task_generate_log
 def read_poscar_vectors(path_poscar: Path):
@@ -127,28 +190,18 @@ def read_poscar_vectors(path_poscar: Path):
         >>> from pathlib import Path
         >>> comment, scale, v1, v2, v3 = read_poscar_vectors(Path("POSCAR"))
     """
-    # Validate file existence before processing to fail fast on missing inputs
-    if not path_poscar.exists():
-        raise FileNotFoundError(f"POSCAR file not found at {path_poscar.resolve()}")
-    
-    # Context manager ensures proper file handling and automatic cleanup
-    with path_poscar.open(encoding='utf-8') as file:
-        try:
-            # Read header comment (often contains structural info)
-            cflat = file.readline().strip()
-            
-            # Parse universal scaling factor for lattice vectors
-            scale = np.float64(file.readline().strip())
-            
-            # Extract and convert lattice vectors (next 3 lines) to float arrays
-            a1 = np.array(file.readline().strip().split(), dtype=np.float64)
-            a2 = np.array(file.readline().strip().split(), dtype=np.float64)
-            a3 = np.array(file.readline().strip().split(), dtype=np.float64)
-            return cflat, scale, a1, a2, a3
-            
-        # Wrap low-level errors with context about parsing failure
-        except Exception as e:
-            raise ValueError(f"Error reading POSCAR vectors: {str(e)}") from e
+    # Single bulk read of the file; only the first 5 lines are needed
+    # A missing file is reported by the read itself, without a separate existence check
+    try:
+        lines_poscar = path_poscar.read_text(encoding='utf-8').splitlines()[:5]
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"POSCAR file not found at {path_poscar.resolve()}") from e
+    # Parse scaling factor and lattice vectors (shared with the template parsing)
+    scale, a1, a2, a3 = _parse_lattice(lines_poscar)
+
+    # Read header comment (often contains structural info)
+    cflat = lines_poscar[0].strip()
+    return cflat, scale, a1, a2, a3
 
 
 if __name__ == "__main__":
@@ -12,9 +12,9 @@ Date: 08/2024
 from pathlib import Path
 from incar_writer import run_write_incar
 from kpoints_writer import run_kpoints_writer
-from poscar_writer import run_write_poscar
+from poscar_writer import run_write_poscar, get_poscar_template_vectors
 from Monochalcogenides2D.common.config import PATH_FOLDER_OUTPUT, LIST_MQ, LIST_SP
-from Monochalcogenides2D.common.utils import init_logger, task_generate_log, progress_bar_show, get_mq_elements
+from Monochalcogenides2D.common.utils import init_logger, task_generate_log, get_mq_elements, run_systems_in_pool
 
 
 @task_generate_log
@@ -33,11 +33,14 @@ def run_generate_inputs(name_output_folder: str):
 
     Raises:
         OSError: If directory creation fails
-        RuntimeError: Propagated from file generation functions
+        FileNotFoundError, ValueError: Propagated from file generation functions
 
     Example:
         >>> run_generate_inputs('vasp_simulations')
         Generates input files for all material/space group combinations
+
+    Notes:
+        Systems are distributed over a multiprocessing pool (one process per CPU core)
     """
     # Initialize root output directory with safe creation
     # Critical: Ensures base path exists before nested generation
@@ -46,43 +49,56 @@ def run_generate_inputs(name_output_folder: str):
 
     logger.info(f"Output directory set to: {path_output.resolve()}\n")
 
-    system_count = 0
-    progress_bar_show(system_count)
-    # Process each space group in predefined list
-    # Why: Different crystal structures require distinct templates
+    # Space group folders first, the workers only create their material folder
     for sp in LIST_SP:
-        # Initialize path placeholder for current space group
-        path_output_sp = ""
-
-        # Process each material system in predefined list
-        # Note: Materials are represented as string identifiers (e.g., "NaCl")
-        for mq in LIST_MQ:
-            # Create material-specific subdirectory under space group
-            # Structure: root/space_group/material_system/
-            path_output_sp = path_output.joinpath(sp, mq)
-            path_output_sp.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Processing space group: {sp} with material: {mq}")
-
-            # Generate POSCAR file with space-group-appropriate template
-            # Note: get_mq_elements() converts material ID to element list
-            if run_write_poscar(path_output_sp, get_mq_elements(mq), sp):
-                logger.info(f"POSCAR file created successfully for {mq} in space group {sp}.")
-            else:
-                logger.info(f"Failed to create POSCAR file for {mq} in space group {sp}.")
-                raise RuntimeError(f"POSCAR generation failed for {mq} in space group {sp}.")
-
-            # Generate matching INCAR file with material-specific parameters
-            # Critical: Must run after POSCAR for folder structure consistency
-            run_write_incar(path_output_sp, get_mq_elements(mq))
-
-            # Generate matching KPOINTS file with material-specific parameters
-            # Critical: Must run after POSCAR for folder structure consistency
-            run_kpoints_writer(path_output_sp)
-
-            system_count += 1
-            progress_bar_show(system_count)
-            logger.info(f"Completed input generation for {mq} in space group {sp}. Total systems: {system_count}\n\n")
+        path_output.joinpath(sp).mkdir(exist_ok=True)
+
+    # Structure: root/space_group/material_system/
+    # Element lists are resolved once per material instead of twice per (space group, material) pair
+    dict_elements = {mq: get_mq_elements(mq) for mq in LIST_MQ}
+    list_systems = [(path_output, sp, mq, dict_elements[mq]) for sp in LIST_SP for mq in LIST_MQ]
+
+    for system_count, (sp, mq) in enumerate(run_systems_in_pool(process_input_system, list_systems), start=1):
+        logger.info(f"Completed input generation for {mq} in space group {sp}. Total systems: {system_count}\n\n")
+
+
+def process_input_system(system_info: tuple) -> tuple:
+    """Generates the POSCAR, INCAR, POTCAR and KPOINTS files of a single space group/material pair.
+
+    Worker of run_generate_inputs, kept at module level so it can be dispatched to a process pool.
+
+    Args:
+        system_info: (path_output, sp, mq, list_elements) describing the system to process
+
+    Returns:
+        tuple: (sp, mq) of the processed system
+
+    Raises:
+        FileNotFoundError: If the template POSCAR or a POTCAR file is missing
+        ValueError: If the template POSCAR is malformed
+    """
+    path_output, sp, mq, list_elements = system_info
+
+    # Create material-specific subdirectory under space group
+    # Structure: root/space_group/material_system/ (space group folder created by run_generate_inputs)
+    path_output_sp = path_output.joinpath(sp, mq)
+    path_output_sp.mkdir(exist_ok=True)
+    logger.info(f"Processing space group: {sp} with material: {mq}")
+
+    # Generate POSCAR file with space-group-appropriate template
+    # Failures (missing/invalid template, write errors) are raised by run_write_poscar
+    run_write_poscar(path_output_sp, list_elements, sp)
+    logger.info(f"POSCAR file created successfully for {mq} in space group {sp}.")
+
+    # Generate matching INCAR file with material-specific parameters
+    # Critical: Must run after POSCAR for folder structure consistency
+    run_write_incar(path_output_sp, list_elements)
+
+    # Generate matching KPOINTS file with material-specific parameters
+    # Lattice comes from the cached space group template, the same lines written to the POSCAR
+    run_kpoints_writer(path_output_sp, get_poscar_template_vectors(sp))
 
+    return sp, mq
 
 
 if __name__ == "__main__":
@@ -9,10 +9,12 @@ Email: murbach@df.ufscar.br
 Date: 08/2024
 """
 
+import os
 import shutil
 from pathlib import Path
-from Monochalcogenides2D.common.config import LIST_MQ, LIST_SP, LIST_ORDERED_BC_TAGS, PATH_FOLDER_OUTPUT
-from Monochalcogenides2D.common.utils import init_logger, task_generate_log, progress_bar_show, order_dict_by_list
+from Monochalcogenides2D.common.config import (LIST_MQ, LIST_SP, LIST_ORDERED_BC_TAGS, LIST_BC_INPUT_FILES,
+                                                LIST_BC_REMOVED_TAGS, DICT_BC_INCAR_FLAGS, PATH_FOLDER_OUTPUT)
+from Monochalcogenides2D.common.utils import init_logger, task_generate_log, order_dict_by_list, run_systems_in_pool
 from Monochalcogenides2D.vasp_data_extractor import incar_parsers, outcar_parsers
 
 
@@ -23,8 +25,8 @@ def generate_bader_input_files(path_input_base: Path, name_output_bc: str):
 
     Processes all combinations of space groups (LIST_SP) and materials (LIST_MQ) by:
     1. Creating organized directory structures
-    2. Copying essential VASP calculation files (POSCAR, POTCAR, INCAR, KPOINTS)
-    3. Updating INCAR files with Bader-specific grid parameters from OUTCAR
+    2. Copying essential VASP calculation files (POSCAR, POTCAR, KPOINTS)
+    3. Writing INCAR files with Bader-specific grid parameters from OUTCAR
     4. Tracking progress with logging and visual progress bars
 
     Args:
@@ -37,86 +39,157 @@ def generate_bader_input_files(path_input_base: Path, name_output_bc: str):
 
     Notes:
         Requires predefined LIST_MQ (materials) and LIST_SP (space groups) lists
-        Depends on external functions: outcar_parsers.get_number_grid, update_incar_bc, progress_bar_show
+        Depends on external functions: process_bader_system, run_systems_in_pool
+        Systems are distributed over a multiprocessing pool (one process per CPU core)
     """
 
     path_output_bc = PATH_FOLDER_OUTPUT.joinpath(name_output_bc)
 
-    system_count = 0
-    progress_bar_show(system_count)
-    for mq in LIST_MQ:
-        # Initialize path placeholder for current space group
-        path_output_sp = ""
-        path_bc = ""
-        path_bc = path_input_base.joinpath(mq)
-        # Process each material system in predefined list
-        # Note: Materials are represented as string identifiers (e.g., "NaCl")
-        for sp in LIST_SP:
-            # Create material-specific subdirectory under space group
-            # Structure: root/space_group/material_system/
-            path_output_sp = path_output_bc.joinpath(sp, mq)
-            path_output_sp.mkdir(parents=True, exist_ok=True)
-            
-            path_bc_sp = path_bc.joinpath(sp)
-            logger.info(f"Processing space group: {sp} with material: {mq}")
-
-            if path_bc_sp.is_dir():
-                # Copy necessary VASP input files from base directory
-                shutil.copy2(path_bc_sp.joinpath("POSCAR"), path_output_sp.joinpath("POSCAR"))
-                shutil.copy2(path_bc_sp.joinpath("POTCAR"), path_output_sp.joinpath("POTCAR"))
-                shutil.copy2(path_bc_sp.joinpath("INCAR"), path_output_sp.joinpath("INCAR"))
-                shutil.copy2(path_bc_sp.joinpath("KPOINTS"), path_output_sp.joinpath("KPOINTS"))
-                logger.info(f"Copied VASP input files to {path_output_sp.resolve()}")
-            else:
-                logger.warning(f"Base path for Bader charge files does not exist: {path_bc_sp.resolve()}") 
-                raise FileNotFoundError(f"Base path for Bader charge files does not exist: {path_bc_sp.resolve()}")
-            
-            path_bc_sp_outcar = path_bc_sp.joinpath("OUTCAR")
-
-            # Update INCAR file with Bader Charge settings
-            ngxf, ngyf, ngzf = outcar_parsers.get_number_grid(path_bc_sp_outcar)
-            ngrid = [(3 * int(ngxf)), (3 * int(ngyf)), (3 * int(ngzf))]
-            update_incar_bc(path_output_sp.joinpath("INCAR"), f"{mq} [Space Group: {sp}]", ngrid)
-            logger.info(f"Updated INCAR for {mq} in space group {sp} with grid dimensions: {ngrid}")
-
-            # Log progress and update system count
-            system_count += 1
-            progress_bar_show(system_count)
-            logger.info(f"Completed input generation for {mq} in space group {sp}. Total systems: {system_count}\n\n")
-        
-
-def update_incar_bc(path_incar: Path, system_description: str, number_of_grid: list[int]):
+    # Space group folders are shared by all materials, so they are created once here in a single batch
+    # and the workers only create their own leaf folder
+    for sp in LIST_SP:
+        path_output_bc.joinpath(sp).mkdir(parents=True, exist_ok=True)
+
+    # Every (material, space group) pair writes to its own folder, so the pairs are processed in parallel
+    # Structure: root/space_group/material_system/
+    list_systems = [(path_input_base, path_output_bc, mq, sp) for mq in LIST_MQ for sp in LIST_SP]
+    for system_count, (mq, sp) in enumerate(run_systems_in_pool(process_bader_system, list_systems), start=1):
+        # Log progress and update system count
+        logger.info(f"Completed input generation for {mq} in space group {sp}. Total systems: {system_count}\n\n")
+
+
+def process_bader_system(system_info: tuple) -> tuple:
+    """
+    Generates the Bader charge input files for a single material/space group pair.
+
+    Worker of generate_bader_input_files, kept at module level so it can be dispatched to a process pool.
+
+    Args:
+        system_info (tuple): (path_input_base, path_output_bc, mq, sp) describing the system to process
+
+    Returns:
+        tuple: (mq, sp) of the processed system
+
+    Raises:
+        FileNotFoundError: If source directory for the material/space group is missing
+    """
+    path_input_base, path_output_bc, mq, sp = system_info
+
+    # Create material-specific subdirectory under space group
+    # Parent space group folder already exists (created by generate_bader_input_files)
+    path_output_sp = path_output_bc.joinpath(sp, mq)
+    path_output_sp.mkdir(exist_ok=True)
+
+    path_bc_sp = path_input_base.joinpath(mq, sp)
+    logger.info(f"Processing space group: {sp} with material: {mq}")
+
+    if path_bc_sp.is_dir():
+        # Copy necessary VASP input files from base directory
+        copy_bc_input_files(path_bc_sp, path_output_sp)
+        logger.info(f"Copied VASP input files to {path_output_sp.resolve()}")
+    else:
+        logger.warning(f"Base path for Bader charge files does not exist: {path_bc_sp.resolve()}")
+        raise FileNotFoundError(f"Base path for Bader charge files does not exist: {path_bc_sp.resolve()}")
+
+    path_bc_sp_outcar = path_bc_sp.joinpath("OUTCAR")
+
+    # Write INCAR file with Bader Charge settings directly from the source INCAR
+    ngxf, ngyf, ngzf = outcar_parsers.get_number_grid(path_bc_sp_outcar)
+    ngrid = [(3 * int(ngxf)), (3 * int(ngyf)), (3 * int(ngzf))]
+    update_incar_bc(path_bc_sp.joinpath("INCAR"), path_output_sp.joinpath("INCAR"), f"{mq} [Space Group: {sp}]", ngrid)
+    logger.info(f"Updated INCAR for {mq} in space group {sp} with grid dimensions: {ngrid}")
+
+    return mq, sp
+
+
+def copy_bc_input_files(path_source: Path, path_destination: Path):
+    """
+    Copies the VASP input files required by the Bader charge step.
+
+    Each system already runs in its own pool process, so the few small copies are done serially.
+
+    Args:
+        path_source (Path): Folder of the converged simulation
+        path_destination (Path): Folder where the Bader charge inputs are written
+    """
+    # Only the content and timestamps are needed, so _fast_copy skips the
+    # permission/xattr round-trip of copy2 and copies inside the kernel
+    for name in LIST_BC_INPUT_FILES:
+        _fast_copy(path_source.joinpath(name), path_destination.joinpath(name))
+
+
+def _fast_copy(path_source: Path, path_destination: Path):
+    """
+    Copies a file inside the kernel, keeping only its modification time.
+
+    Uses os.copy_file_range (reflink/zero-copy on Linux) and falls back to shutil.copyfile
+    when it is unavailable on the platform or not supported by the filesystem.
+
+    Args:
+        path_source (Path): File to be copied
+        path_destination (Path): Destination file (created or truncated)
     """
-    Updates an INCAR file for Bader charge analysis calculations.
+    stat_source = os.stat(path_source)
+    if hasattr(os, "copy_file_range"):
+        fd_in = os.open(path_source, os.O_RDONLY)
+        try:
+            fd_out = os.open(path_destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # copy_file_range may copy fewer bytes than requested, so loop until the whole file is copied
+                remaining = stat_source.st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fd_in, fd_out, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                # e.g. EXDEV/ENOSYS on older kernels or unsupported filesystems
+                remaining = -1
+            finally:
+                os.close(fd_out)
+        finally:
+            os.close(fd_in)
+    else:
+        remaining = -1
+
+    if remaining != 0:
+        shutil.copyfile(path_source, path_destination)
+    # POSCAR/POTCAR/KPOINTS do not need permissions or xattrs, only the timestamps
+    os.utime(path_destination, ns=(stat_source.st_atime_ns, stat_source.st_mtime_ns))
+
+
+def update_incar_bc(path_incar: Path, path_incar_output: Path, system_description: str, number_of_grid: list[int]):
+    """
+    Writes the INCAR file for Bader charge analysis calculations from a converged simulation INCAR.
+
+    The source INCAR is read once and the Bader INCAR is written once, without an intermediate copy.
 
     Args:
-        path_incar (Path): Path to the INCAR file
+        path_incar (Path): Path to the source INCAR file
+        path_incar_output (Path): Path where the Bader INCAR file is written
         system_description (str): System description for the SYSTEM tag
         number_of_grid (list[int]): List of grid parameters in the order:
         [NGXF, NGYF, NGZF]
     """
     # Parse the original INCAR file
     dict_flags_incar = incar_parsers.create_incar_dict_flags(path_incar)
-    dict_flags_incar['SYSTEM'] = system_description + ' Barder Charge (auto generated INCAR)'
-    dict_flags_incar['ISPIN'] = '1'
-    dict_flags_incar['NSW'] = '-1'
-    dict_flags_incar['IBRION'] = '-1'
-    dict_flags_incar['LCHARG'] = '.TRUE.'
-    dict_flags_incar['LAECHG'] = '.TRUE.'
-    dict_flags_incar['NGXF'] = str(number_of_grid[0])
-    dict_flags_incar['NGYF'] = str(number_of_grid[1])
-    dict_flags_incar['NGZF'] = str(number_of_grid[2])
-
-    dict_flags_incar.pop('ADDGRID', None)  # Remove ADDGRID if it exists
-    dict_flags_incar.pop('EDIFFG', None)  # Remove EDIFFG if it exists
-    dict_flags_incar.pop('ISIF', None)  # Remove ISIF if it exists
-    dict_flags_incar.pop('POTIM', None)  # Remove POTIM if it exists
-    dict_flags_incar.pop('STRESSTYPE', None)  # Remove STRESSTYPE if it exists
+    # Apply all Bader Charge replacements in a single update (fixed flags + system-specific ones)
+    dict_flags_incar.update({
+        'SYSTEM': system_description + ' Barder Charge (auto generated INCAR)',
+        **DICT_BC_INCAR_FLAGS,
+        'NGXF': str(number_of_grid[0]),
+        'NGYF': str(number_of_grid[1]),
+        'NGZF': str(number_of_grid[2]),
+    })
+
+    # Remove relaxation-only tags if they exist
+    for tag in LIST_BC_REMOVED_TAGS:
+        dict_flags_incar.pop(tag, None)
 
     bc_incar_flags = order_dict_by_list(dict_flags_incar, LIST_ORDERED_BC_TAGS)
     # Convert the ordered dictionary back to INCAR format
     bc_incar_flags = incar_parsers.dict_to_pattern_incar(bc_incar_flags)
-    with open(path_incar, 'w') as incar_file:
+    with open(path_incar_output, 'w') as incar_file:
         incar_file.write(bc_incar_flags)
 
 